@@ -0,0 +1,233 @@
+# gpio_page.py — dashboard HTML for GPIOLive (main.py)
+# One bytes literal: when this module is frozen into the firmware (add it to
+# the board's manifest.py with `module("gpio_page.py")`) the page lives in
+# flash instead of on the heap. main.py never copies it: it sends memoryview
+# slices cut at the placeholders {OVERLAY}, {ADC} and {NA} (each must appear
+# once, in that order) with the pin JSON in between. Non-ASCII characters
+# are written as UTF-8 \x escapes.
+
+PAGE = (
+    b"<!doctype html><html><head><meta charset='utf-8'/>"
+    b"<meta name='viewport' content='width=device-width,initial-scale=1'/>"
+    b"<title>Seeed Studio XIAO ESP32S3 GPIO Pin Monitoring</title>"
+    b"<style>"
+   b" /* ---- color system (light/dark) ---- */"
+    b":root{"
+    b" --bg:#ffffff; --text:#111;"
+    b" --topbar-bg:rgba(255,255,255,.92); --topbar-br:#e6e7eb;"
+    b" --pill-bg:#f2f4f7; --pill-text:#111;"
+    b" --section-bg:#f3f4f6;"       b"/* panel background */"
+    b" --card-bg:#ffffff;"          b"/* tile background */"
+    b" --card-br:rgba(0,0,0,.10);"  b"/* tile/panel borders */"
+    b" --adc-bg:#777; --hole-hi:#d94134; --hole-lo:#2e9e5f;"
+    b"}"
+    b"[data-theme='dark']{"
+    b" --bg:#0b1222; --text:#e5e7eb;"
+    b" --topbar-bg:rgba(11,18,34,.92); --topbar-br:#1f2a3d;"
+    b" --pill-bg:#0f1a2e; --pill-text:#e5e7eb;"
+    b" --section-bg:#0f172a;"
+    b" --card-bg:#152238;"          b"/* brighter than section so cards pop */"
+    b" --card-br:#27344b;"
+    b" --adc-bg:#505965;"
+    b"}"
+    b"/* ---- layout ---- */"
+    b"html,body{margin:0;padding:0;background:var(--bg);color:var(--text);font-family:Roboto,Arial,Helvetica,sans-serif}"
+    b".topbar{position:sticky;top:0;z-index:10;background:var(--topbar-bg);backdrop-filter:saturate(180%) blur(6px);border-bottom:1px solid var(--topbar-br)}"
+    b".topin{max-width:980px;margin:0 auto;padding:8px 12px;display:flex;flex-direction:column;align-items:center;gap:8px}"
+    b".title{font-weight:800;font-size:18px;text-align:center}"
+    b".pills{display:flex;gap:12px;align-items:center;flex-wrap:wrap;justify-content:center}"
+    b".pill{font-weight:700;font-size:12px;padding:6px 10px;border-radius:999px;background:var(--pill-bg);color:var(--pill-text);border:1px solid var(--card-br)}"
+    b".pill .lab{opacity:.7;margin-right:6px}"
+    b".pill select{border:none;background:transparent;font:inherit;outline:none;cursor:pointer;color:var(--pill-text)}"
+    b".tab{display:inline-flex;border-radius:999px;overflow:hidden;border:1px solid var(--topbar-br);background:var(--pill-bg)}"
+    b".tab button{padding:6px 10px;font-weight:700;font-size:12px;border:none;background:transparent;cursor:pointer;color:var(--pill-text)}"
+    b".tab button.act{background:#e5e7eb;color:#111}"
+    b"[data-theme='dark'] .tab button.act{background:#22314a;color:#e5e7eb}"
+    b".wrap{max-width:980px;margin:0 auto 18px;padding:0 10px}"
+    b".board{position:relative;width:clamp(240px,48vw,360px);margin:12px auto 0}"
+    b".board img{width:100%;display:block;user-select:none;pointer-events:none}"
+    b".hole{position:absolute;width:23.6px;height:23.6px;margin:-11.8px 0 0 -11.8px;border-radius:50%;display:flex;align-items:center;justify-content:center;transition:background-color .25s ease,transform .08s ease;border:2px solid rgba(0,0,0,.18);box-shadow:0 1px 2px rgba(0,0,0,.15) inset}"
+    b".hole.lo{background:var(--hole-lo)}.hole.hi{background:var(--hole-hi)}.hole.na{background:#bdbdbd}"
+    b".lbl{position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);font-size:9px;font-weight:700;color:#fff;text-shadow:0 1px 1px rgba(0,0,0,.25)}"
+    b".adc{position:absolute;bottom:-6px;left:50%;transform:translateX(-50%);font-size:9px;font-weight:700;padding:1px 4px;border-radius:8px;color:#fff;background:var(--adc-bg);min-width:30px;text-align:center}"
+    b".theme{position:fixed;top:10px;right:10px;z-index:20;background:var(--pill-bg);color:var(--pill-text);border:1px solid var(--card-br);border-radius:999px;padding:6px 10px;font-weight:700;display:flex;align-items:center;gap:6px;cursor:pointer}"
+    b".theme .ic{font-size:14px;line-height:1}"
+    b".section{background:var(--section-bg);border:1px solid var(--card-br);border-radius:14px;padding:12px;margin-top:10px}"
+    b".section>h3{margin:0 0 8px 0;font-size:14px;opacity:.9}"
+    b".cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:10px}"
+    b".card{background:var(--card-bg);color:var(--pill-text);border-radius:12px;padding:10px;border:1px solid var(--card-br);box-shadow:0 1px 0 rgba(0,0,0,.04)}"
+    b".kv{display:grid;grid-template-columns:160px 1fr;gap:8px;margin-top:10px}"
+    b".muted{opacity:.7}"
+    b"</style></head><body>"
+
+    b"<button id='theme' class='theme' title='Toggle theme'><span id='themeIc' class='ic'>\xf0\x9f\x8c\x99</span><span id='themeTxt'>Dark</span></button>"
+
+    b"<div class='topbar'><div class='topin'>"
+      b"<div class='title'>Seeed Studio XIAO ESP32S3 GPIO Pin Monitoring</div>"
+      b"<div class='pills'>"
+        b"<div class='pill'><span class='lab'>IP</span><span id='ip'>\xe2\x80\x94</span></div>"
+        b"<div class='pill'><span class='lab'>Uptime</span><span id='uptime'>0:00</span></div>"
+        b"<div class='pill'><span class='lab'>Heap</span><span id='heap'>\xe2\x80\x94</span></div>"
+        b"<div class='pill'><span class='lab'>Refresh</span>"
+          b"<select id='rate'><option value='250'>250 ms</option>"
+          b"<option value='500' selected>500 ms</option>"
+          b"<option value='1000'>1 s</option><option value='2000'>2 s</option></select>"
+        b"</div>"
+        b"<div class='tab'><button id='tabG' class='act'>GPIO Live</button><button id='tabI'>ESP Info</button></div>"
+      b"</div>"
+    b"</div></div>"
+
+    b"<div class='wrap'>"
+      b"<div id='viewG'>"
+        b"<div class='board'>"
+          b"<img id='board' src='/board.jpg' onerror=\"this.onerror=null;this.src='https://raw.githubusercontent.com/TuzaaBap/Seeed-Studio-XIAO-ESP32S3-GPIOViewer/main/assets/XIAO-ESP32-S3.png'\">"
+          b"<div id='overlay'></div>"
+        b"</div>"
+        b"<small class='muted' style='display:block;text-align:center;margin-top:6px'>Green = LOW, Red = HIGH. ADC pins show voltage.</small>"
+      b"</div>"
+
+      b"<div id='viewI' style='display:none'>"
+        b"<div class='section'><h3>Runtime &amp; Timers</h3><div class='cards' id='secRT'></div></div>"
+        b"<div class='section'><h3>Memory &amp; Storage</h3><div class='cards' id='secMEM'></div></div>"
+        b"<div class='section'><h3>Network &amp; Connectivity</h3><div class='cards' id='secNET'></div></div>"
+        b"<div class='section'><h3>Firmware &amp; System Info</h3><div class='kv' id='secFW'></div></div>"
+      b"</div>"
+    b"</div>"
+
+    b"<script>"
+    b"/* theme bootstrap */"
+    b"(function(){try{var key='theme', saved=localStorage.getItem(key), prefers=window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches?'dark':'light';"
+    b"var t=saved||prefers;document.documentElement.setAttribute('data-theme',t);"
+    b"var ic=document.getElementById('themeIc'),tx=document.getElementById('themeTxt');"
+    b"function setUI(x){if(!ic||!tx)return;if(x==='dark'){ic.textContent='\xf0\x9f\x8c\x99';tx.textContent='Dark';}else{ic.textContent='\xe2\x98\x80\xef\xb8\x8f';tx.textContent='Light';}}"
+    b"setUI(t);document.getElementById('theme').onclick=function(){var cur=(document.documentElement.getAttribute('data-theme')==='dark')?'dark':'light';"
+    b"var nxt=(cur==='dark')?'light':'dark';document.documentElement.setAttribute('data-theme',nxt);localStorage.setItem(key,nxt);setUI(nxt);};}catch(_){}})();"
+
+    b"/* tabs */"
+    b"var tabG=document.getElementById('tabG'),tabI=document.getElementById('tabI');"
+    b"var viewG=document.getElementById('viewG'),viewI=document.getElementById('viewI');"
+    b"function showG(){tabG.classList.add('act');tabI.classList.remove('act');viewG.style.display='';viewI.style.display='none';localStorage.setItem('view','gpio');}"
+    b"function showI(){tabI.classList.add('act');tabG.classList.remove('act');viewI.style.display='';viewG.style.display='none';localStorage.setItem('view','info');}"
+    b"tabG.onclick=showG;tabI.onclick=showI;(function(){var v=localStorage.getItem('view');if(v==='info')showI();})();"
+
+    b"/* constants */"
+    b"const MAP={OVERLAY};const ADC_D={ADC};const NA_PINS=new Set({NA});"
+    b"const overlay=document.getElementById('overlay');const ipEl=document.getElementById('ip');const heapEl=document.getElementById('heap');"
+    b"const uptimeEl=document.getElementById('uptime');const rateSel=document.getElementById('rate');"
+    b"ipEl.textContent=location.host||(location.hostname+(location.port?':'+location.port:''));"
+
+    b"/* uptime ticker */"
+    b"let bootEpochMs=null;"
+    b"function setUptimeBase(u){if(u!=null&&bootEpochMs==null){bootEpochMs=Date.now()-(u*1000);}}"
+    b"function currentUptime(){if(bootEpochMs==null)return '\xe2\x80\x94';var sec=((Date.now()-bootEpochMs)/1000)|0;var h=(sec/3600)|0,m=((sec%3600)/60)|0,s=sec%60;"
+    b"return (h>0?((''+h).padStart(2,'0')+':'):'')+(''+m).padStart(2,'0')+':'+(''+s).padStart(2,'0');}"
+    b"function tickUptime(){if(bootEpochMs==null)return;var sec=((Date.now()-bootEpochMs)/1000)|0;var h=(sec/3600)|0,m=((sec%3600)/60)|0,s=sec%60;"
+    b"uptimeEl.textContent=(h>0?(h*60+m):m)+':'+(''+s).padStart(2,'0');var uc=document.getElementById('upCard');if(uc){uc.textContent=currentUptime();}}"
+    b"setInterval(tickUptime,1000);"
+
+    b"/* build GPIO dots */"
+    b"for(const k of Object.keys(MAP)){const d=Number(k),p=MAP[k];const el=document.createElement('div');el.className='hole lo';el.dataset.d=d;"
+    b"el.style.left=p.x+'%';el.style.top=p.y+'%';const lbl=document.createElement('div');lbl.className='lbl';lbl.textContent='D'+d;el.appendChild(lbl);"
+    b"const adc=document.createElement('div');adc.className='adc';adc.textContent='';el.appendChild(adc);overlay.appendChild(el);}"
+
+    b"/* helpers */"
+    b"function fmtB(b){if(b==null)return '\xe2\x80\x94';var kb=b/1024,mb=kb/1024;return (mb>=1?(mb.toFixed(2)+' MB'):(kb.toFixed(0)+' KB'));}"
+    b"function fmtBytes(b){if(b==null||!isFinite(b))return '\xe2\x80\x94';var kb=b/1024,mb=kb/1024,gb=mb/1024;if(gb>=1)return gb.toFixed(2)+' GB';if(mb>=1)return mb.toFixed(2)+' MB';if(kb>=1)return kb.toFixed(0)+' KB';return b+' B';}"
+    b"function fmtPct(p){if(p==null||!isFinite(p))return '\xe2\x80\x94';return (Math.round(p*10)/10)+'%';}"
+    b"function badgeColor(v){if(v==null)return getComputedStyle(document.documentElement).getPropertyValue('--adc-bg')||'#777';var t=Math.max(0,Math.min(1,v/3.3));var hue=120*(1-t);var light=35+45*t;return 'hsl('+hue+'deg 90% '+light+'%)';}"
+    b"function avg(arr){if(!arr||!arr.length)return null;var s=0;for(var i=0;i<arr.length;i++)s+=arr[i];return s/arr.length;}"
+    b"function rel(ms){if(!ms)return '\xe2\x80\x94';var d=Date.now()-ms;if(d<0)d=0;var s=Math.floor(d/1000);if(s<1)return 'just now';if(s<60)return s+'s ago';var m=Math.floor(s/60);if(m<60)return m+'m ago';var h=Math.floor(m/60);return h+'h ago';}"
+    b"let lastADC={};"
+
+    b"function applyADC(adc){lastADC=adc||{};for(const el of overlay.children){const d=Number(el.dataset.d);const badge=el.querySelector('.adc');const v=lastADC['D'+d];"
+    b"if(v==null){badge.textContent='';badge.style.background='var(--adc-bg)';}else{badge.textContent=v.toFixed(2)+' V';badge.style.background=badgeColor(v);}}}"
+    b"function applyLevels(levels){for(const el of overlay.children){const d=Number(el.dataset.d);if(NA_PINS.has(d)){el.className='hole na';continue;}const v=lastADC['D'+d];"
+    b"if(v!=null){el.className='hole '+(v>=2.0?'hi':'lo');continue;}const bit=(levels&&('D'+d in levels))?levels['D'+d]:0;el.className='hole '+(bit?'hi':'lo');}}"
+
+    b"/* GPIO view */"
+    b"function applyPins(pins){"
+    b"const adcv={};for(const d of pins.order){const v=pins.values[d];if(v&&v.volt!=null&&v.volt>=0)adcv['D'+d]=v.volt;}applyADC(adcv);"
+    b"const levels={};for(const d of pins.order){const v=pins.values[d];levels['D'+d]=(v&&v.digital===1)?1:0;}applyLevels(levels);}"
+    b"function applyBin(buf){const dv=new DataView(buf);setUptimeBase(dv.getUint32(0));heapEl.textContent=fmtB(dv.getUint32(4));"
+    b"const adcv={},levels={};for(let o=8;o+4<=dv.byteLength;o+=4){const d=dv.getUint8(o),mv=dv.getUint16(o+2);"
+    b"if(mv!==0xFFFF)adcv['D'+d]=mv/1000;levels['D'+d]=(dv.getUint8(o+1)===1)?1:0;}applyADC(adcv);applyLevels(levels);}"
+
+    b"/* ESP Info view + link status */"
+    b"const secRT=document.getElementById('secRT');const secMEM=document.getElementById('secMEM');const secNET=document.getElementById('secNET');const secFW=document.getElementById('secFW');"
+    b"function card(label,value){return '<div class=\\'card\\'><div class=\\'muted\\'>'+(label||'')+'</div><b>'+(value==null?'\xe2\x80\x94':value)+'</b></div>';}"
+    b"let lastOkMs=0, failCount=0, rttSamples=[];"
+    b"function updateLinkUI(){var link=document.getElementById('linkState');var last=document.getElementById('lastUpd');var rtt=document.getElementById('rttAvg');"
+    b"if(!link||!last||!rtt)return; var ok=(failCount<3); link.textContent=ok?'Connected':'Disconnected'; last.textContent=rel(lastOkMs);"
+    b"var a=avg(rttSamples); rtt.textContent=(a==null)?'\xe2\x80\x94':(Math.round(a)+' ms');}"
+    b"setInterval(updateLinkUI,1000);"
+
+    b"function applyInfo(d){"
+    b"   if(d.heap)heapEl.textContent=fmtB(d.heap.free); if(d.ip)ipEl.textContent=d.ip;"
+    b"   if(d.uptime_s!=null) setUptimeBase(d.uptime_s);"
+    b"   var heapUsed=(d.heap_used!=null)?d.heap_used:(d.heap&&d.heap.alloc);"
+    b"   var heapFree=(d.heap_free!=null)?d.heap_free:(d.heap&&d.heap.free);"
+    b"   var heapTotal=(d.heap_total!=null)?d.heap_total:((heapUsed!=null&&heapFree!=null)?(heapUsed+heapFree):null);"
+    b"   var fsUsed=(d.fs_used!=null)?d.fs_used:(d.fs&&d.fs.used);"
+    b"   var fsTotal=(d.fs_total!=null)?d.fs_total:(d.fs&&d.fs.total);"
+    b"   var fsPct=(fsUsed!=null&&fsTotal)?(fsUsed/fsTotal*100):null;"
+    b"   var flashSize=(d.flash_size!=null)?d.flash_size:null;"
+    b"   var flashPct=(flashSize&&fsUsed!=null)?(fsUsed/flashSize*100):null;"
+
+    b"   secRT.innerHTML=["
+    b"     card('CPU', (d.cpu_freq_mhz!=null?d.cpu_freq_mhz+' MHz':'\xe2\x80\x94')),"
+    b"     card('Uptime', '<span id=\\'upCard\\'>'+currentUptime()+'</span>')"
+    b"   ].join('');"
+
+    b"   secMEM.innerHTML=["
+    b"     card('Heap Used/Total', (fmtBytes(heapUsed)+' / '+fmtBytes(heapTotal))),"
+    b"     card('FS Used/Total', (fmtBytes(fsUsed)+' / '+fmtBytes(fsTotal))),"
+    b"     card('FS Usage %', fmtPct(fsPct)),"
+    b"     card('PSRAM', ((d.psram_used!=null?fmtBytes(d.psram_used):'\xe2\x80\x94')+' / '+(d.psram_total!=null?fmtBytes(d.psram_total):'\xe2\x80\x94'))),"
+    b"     card('Flash Size', fmtBytes(flashSize)),"
+    b"     card('Flash Usage %', fmtPct(flashPct))"
+    b"   ].join('');"
+
+    b"   secNET.innerHTML=["
+    b"     card('IP', (d.ip||'\xe2\x80\x94')),"
+    b"     card('SSID', d.ssid),"
+    b"     card('RSSI', (d.rssi!=null?d.rssi+' dBm':'\xe2\x80\x94')),"
+    b"     card('MAC (STA)', d.mac_sta||d.mac),"
+    b"     card('Netmask', d.netmask),"
+    b"     card('Gateway', d.gw),"
+    b"     card('DNS', d.dns)"
+    b"   ].join('');"
+
+    b"   var fw=(d.firmware||{}); var build=(fw.build&&fw.build.join)?fw.build.join('.'):(fw.build||'\xe2\x80\x94');"
+    b"   secFW.innerHTML=["
+    b"     '<div class=\\'muted\\'>Chip Model</div><div>'+(d.chip_model||'ESP32-S3')+'</div>',"
+    b"     '<div class=\\'muted\\'>Chip Revision</div><div>'+(d.chip_revision!=null?d.chip_revision:'\xe2\x80\x94')+'</div>',"
+    b"     '<div class=\\'muted\\'>Cores</div><div>'+(d.cores!=null?d.cores:'2')+'</div>',"
+    b"     '<div class=\\'muted\\'>Link</div><div id=\\'linkState\\'>\xe2\x80\x94</div>',"
+    b"     '<div class=\\'muted\\'>Last Update</div><div id=\\'lastUpd\\'>\xe2\x80\x94</div>',"
+    b"     '<div class=\\'muted\\'>RTT (avg)</div><div id=\\'rttAvg\\'>\xe2\x80\x94</div>',"
+    b"     '<div class=\\'muted\\'>Board</div><div>'+(d.board||'\xe2\x80\x94')+'</div>',"
+    b"     '<div class=\\'muted\\'>MicroPython</div><div>'+(fw.micropython||'\xe2\x80\x94')+'</div>',"
+    b"     '<div class=\\'muted\\'>Build</div><div>'+build+'</div>'"
+    b"   ].join('');"
+    b"   updateLinkUI();"
+    b"}"
+
+    b"/* polling: the GPIO view only needs the packed /api/pins.bin; the Info view takes /api/poll */"
+    b"let timer=null,polls=0;"
+    b"async function poll(){"
+    b" try{"
+    b"   var t0=Date.now();"
+    b"   /* every 20th GPIO-view poll is a full one too, so the IP pill keeps following info.ip */"
+    b"   var gpio=(viewG.style.display!=='none')&&(polls++%20!==0);"
+    b"   const r=await fetch(gpio?'/api/pins.bin':'/api/poll',{cache:'no-store'});"
+    b"   if(!r.ok)throw new Error('HTTP '+r.status);"
+    b"   const p=gpio?(await r.arrayBuffer()):(await r.json());"
+    b"   var dt=Date.now()-t0; rttSamples.push(dt); if(rttSamples.length>5) rttSamples.shift();"
+    b"   lastOkMs=Date.now(); failCount=0;"
+    b"   if(gpio){applyBin(p);}else{applyPins(p.pins); applyInfo(p.info);}"
+    b" }catch(_){ failCount++; if(failCount>50) failCount=50; updateLinkUI(); }"
+    b"}"
+    b"function startPoll(iv){if(timer)clearInterval(timer);timer=setInterval(poll,iv);poll();}"
+    b"startPoll(parseInt(rateSel.value,10));rateSel.addEventListener('change',function(){startPoll(parseInt(rateSel.value,10));});"
+    b"</script></body></html>"
+)
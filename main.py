@@ -1,10 +1,11 @@
 # GPIOLive.py — Seeed Studio XIAO ESP32S3 GPIOViewer v1.0.2
 # Minimal, optimized core with live GPIO overlay + ESP Info tab.
-# APIs: /api/pins, /api/info
-# Only needs: boot.py (Wi-Fi) + this file. 
+# APIs: /api/poll (pins + info), /api/pins, /api/pins.bin, /api/info
+# Only needs: boot.py (Wi-Fi) + this file + gpio_page.py (dashboard HTML). 
 
-import uasyncio as asyncio, json, gc, os, time, sys
-from machine import Pin
+import uasyncio as asyncio, array, json, gc, math, micropython, os, struct, time, sys
+from micropython import const
+from machine import Pin, ADC, freq
 
 # ---------- PIN MAP ----------
 D2GPIO = {
@@ -12,6 +13,7 @@ D2GPIO = {
     6: 43, 7: 44, 8: 7, 9: 8, 10: 9,
 }
 ADC_D = {0, 1, 2, 3, 4, 5, 8, 9, 10}
+UART_D = (6, 7)  # D6/D7 = U0TXD/U0RXD: never reconfigured or sampled, always report 0
 
 # Overlay seed positions (% of image W/H)
 PIN_OVERLAY = {
@@ -24,54 +26,80 @@ PIN_OVERLAY = {
 }
 
 # ---------- SETTINGS ----------
-HTTP_PORT = 8080
-POLL_MS   = 100
-LED_PIN   = 21
-VREF      = 3.30
+# Integer settings are const(): the compiler inlines them at every use in this
+# file instead of a global lookup (edit the number, not the name).
+HTTP_PORT      = const(8080)
+HTTP_BACKLOG   = const(8)     # pending connections the listener queues (several tabs at once)
+TICK_MS        = const(50)    # background ticker period: one LED step, sampler and GC pacing (ms)
+POLL_MS        = const(100)   # background sampling period while the dashboard is polling (ms)
+SAMPLE_IDLE_MS = const(2000)  # sampler pauses when no pins request came for this long (ms)
+LED_PIN        = const(21)
+VREF           = 3.30         # float: const() only takes ints
+GC_S           = const(10)    # background heap check period (s)
+GC_LOW         = const(16384) # collect only when free heap drops below this (bytes)
+GC_MIN_MS      = const(5000)  # min gap between two collections (ms)
+SEND_TIMEOUT_S = const(3)     # max time a client may take to accept a response (s)
+HEAD_TIMEOUT_S = const(5)     # max time a new client may take to send its request head (s)
+HDR_LINES_MAX  = const(32)    # request line + header lines accepted; more gets a 400
+KEEPALIVE_S    = const(5)     # idle time an /api/* connection is held open for the next poll (s)
+KEEPALIVE_MAX  = const(10)    # requests served on one connection before it is closed
 
 # ---------- LED Breathing ----------
+try:
+    from machine import PWM
+except ImportError:
+    PWM = None  # port without PWM: no breathing LED
+
 _pwm = None
 def _try_led_pwm():
     global _pwm
+    if PWM is None:
+        return
     try:
-        from machine import PWM
         _pwm = PWM(Pin(LED_PIN, Pin.OUT), freq=250)
     except:
         _pwm = None
 _try_led_pwm()
 
-async def _breathe():
-    if not _pwm:
-        return
-    import math
-    t = 0
-    while True:
-        try:
-            _pwm.duty_u16(int((1 - (1 + math.cos(t/12)) / 2) * 65535))
-            t += 1
-        except:
-            pass
-        await asyncio.sleep_ms(30)
+# One breath = 64 ticker steps of TICK_MS (~3.2 s); duty values precomputed
+# at boot so a step is one array index instead of a cos() and float maths.
+_BREATH_LUT = array.array('H', [int((1 - (1 + math.cos(i * 2 * math.pi / 64)) / 2) * 65535)
+                                for i in range(64)])
 
 # ---------- CORE STATS ----------
 START_MS = time.ticks_ms()
 D_PINS   = tuple(sorted(D2GPIO.keys()))
+SCAN_D   = tuple(d for d in D_PINS if d not in UART_D)
 
 def uptime_s():
     return time.ticks_diff(time.ticks_ms(), START_MS) // 1000
 
 def cpu_freq_mhz():
     try:
-        import machine
-        return machine.freq() // 1_000_000
+        return freq() // 1_000_000
     except:
         return None
 
 def cores_count():
     return 2  # ESP32-S3 dual core
 
+_LAST_GC = None  # ticks of the last collection while inside the throttle window, else None
+
+def _maybe_gc():
+    # full sweeps stall the server: collect only when heap is low, at most every GC_MIN_MS
+    global _LAST_GC
+    now = time.ticks_ms()
+    if _LAST_GC is not None:
+        if time.ticks_diff(now, _LAST_GC) <= GC_MIN_MS:
+            return
+        # window over: drop the stamp so an idle heap can't let ticks_ms wrap past it
+        _LAST_GC = None
+    if gc.mem_free() < GC_LOW:
+        gc.collect()
+        _LAST_GC = now
+
 def heap_info():
-    gc.collect()
+    _maybe_gc()
     return {'free': gc.mem_free(), 'alloc': gc.mem_alloc()}
 
 def fs_info():
@@ -91,34 +119,53 @@ def flash_size():
         return None
 
 # ---------- NETWORK ----------
-def network_info():
-    """Return basic STA/AP info: ip, ssid, rssi, mac, gw, dns."""
+# WLAN objects are created once; addresses, SSID and MACs only change on
+# (re)association, so they are read into _NET_STATIC and only RSSI is
+# queried per poll.
+try:
+    import network
+    _sta = network.WLAN(network.STA_IF)
+    _ap  = network.WLAN(network.AP_IF)
+except:
+    _sta = _ap = None
+
+def _net_static():
     info = {'ip': None, 'netmask': None, 'gw': None, 'dns': None,
-            'ssid': None, 'rssi': None, 'mac_sta': None, 'mac_ap': None}
+            'ssid': None, 'mac_sta': None, 'mac_ap': None}
     try:
-        import network
-        sta = network.WLAN(network.STA_IF)
-        if sta and sta.active():
-            try: ip, nm, gw, dns = sta.ifconfig(); info.update({'ip': ip, 'netmask': nm, 'gw': gw, 'dns': dns})
+        if _sta and _sta.active():
+            try: ip, nm, gw, dns = _sta.ifconfig(); info.update({'ip': ip, 'netmask': nm, 'gw': gw, 'dns': dns})
             except: pass
-            try: info['ssid'] = sta.config('essid')
-            except: pass
-            try: info['rssi'] = sta.status('rssi')
+            try: info['ssid'] = _sta.config('essid')
             except: pass
             try:
-                mac = sta.config('mac')
+                mac = _sta.config('mac')
                 if mac: info['mac_sta'] = '%02X:%02X:%02X:%02X:%02X:%02X' % tuple(mac)
             except: pass
-        ap = network.WLAN(network.AP_IF)
-        if ap and ap.active():
+        if _ap and _ap.active():
             try:
-                mac = ap.config('mac')
+                mac = _ap.config('mac')
                 if mac: info['mac_ap'] = '%02X:%02X:%02X:%02X:%02X:%02X' % tuple(mac)
             except: pass
     except:
         pass
     return info
 
+_NET_STATIC = _net_static()
+
+def network_info():
+    """Return basic STA/AP info: ip, ssid, rssi, mac, gw, dns."""
+    global _NET_STATIC
+    if _NET_STATIC['ip'] is None:
+        _NET_STATIC = _net_static()  # not associated yet (or link was lost): re-read
+    info = dict(_NET_STATIC)
+    try:
+        info['rssi'] = _sta.status('rssi')
+    except:
+        info['rssi'] = None
+        _NET_STATIC['ip'] = None  # link down: refresh addresses once it is back
+    return info
+
 # ---------- BUILD INFO --------
 
 
@@ -141,9 +188,10 @@ def detect_chip_model():
     except Exception:
         return "ESP32"
 
+_CHIP_MODEL_CACHE = detect_chip_model()
+
 
 def build_info():
-    import sys
     impl = getattr(sys, 'implementation', None)
     ver  = None
     if impl and hasattr(impl, 'version'):
@@ -155,411 +203,688 @@ def build_info():
         'build': ver,
     }
 
-# ---------- GPIO / ADC ----------
-_adc_map = {}
-def _adc_for_gpio(gpio):
-    from machine import ADC
-    try:
-        if gpio not in _adc_map:
-            _adc_map[gpio] = ADC(Pin(gpio))
-        return _adc_map[gpio]
-    except:
-        return None
-
-def read_d_pin(d):
-    """Return {'digital':0|1|None, 'adc':raw or None, 'volt':V or None}"""
-    gpio = D2GPIO.get(d)
-    if gpio is None:
-        return {'digital': None, 'adc': None, 'volt': None}
-
-    # Digital read
-    dig = None
-    try:
-        dig = int(Pin(gpio, Pin.IN).value())
-    except:
-        pass
+_BUILD_INFO_CACHE = build_info()
 
-    # Analog read if applicable
-    raw = volt = None
-    if d in ADC_D:
-        adc = _adc_for_gpio(gpio)
-        if adc:
+# ---------- GPIO / ADC ----------
+# Pin/ADC objects are created once at boot instead of on every read and kept
+# as parallel tuples indexed by position in SCAN_D (None where a pin has no
+# ADC or failed to initialise), so the hot loop only indexes tuples.
+def _init_pins():
+    pins = []
+    adcs = []
+    for d in SCAN_D:
+        gpio = D2GPIO[d]
+        # ADC first: Pin(gpio, Pin.IN) afterwards hands the pad back to the
+        # digital mux while the SAR input stays connected, so both reads work.
+        adc = pin = None
+        if d in ADC_D:
+            try: adc = ADC(Pin(gpio))
+            except: pass
+        try: pin = Pin(gpio, Pin.IN)
+        except: pass
+        pins.append(pin)
+        adcs.append(adc)
+    return tuple(pins), tuple(adcs)
+
+PINS, ADCS = _init_pins()
+
+# ESP32-S3 GPIO_IN_REG / GPIO_IN1_REG (TRM: GPIO base 0x6000_4000 + 0x3C / 0x40).
+# One 32-bit load gives the input level of GPIO0..31 (resp. 32..48), so a
+# snapshot reads two registers instead of calling Pin.value() per pin.
+# Other chips keep the Pin.value() path.
+GPIO_IN  = 0x60004000 + 0x3C  # not const(): above the small-int range
+GPIO_IN1 = 0x60004000 + 0x40
+_MASKS   = tuple(1 << (D2GPIO[d] & 31) for d in SCAN_D)
+_HI      = tuple(D2GPIO[d] >= 32 for d in SCAN_D)
+_mem32 = None
+try:
+    if _CHIP_MODEL_CACHE == 'ESP32-S3':
+        from machine import mem32 as _mem32
+except:
+    _mem32 = None
+
+# Snapshot state lives in flat, preallocated buffers instead of per-pin dicts,
+# indexed like PINS/ADCS: _DIG holds one level byte per pin, _RAW one uint16
+# ADC reading (unboxed, 2 bytes each).
+ADC_FAIL = const(0xFFFF)  # _RAW marker for a failed conversion (real readings are capped below it)
+_ORDER   = list(D_PINS)
+_NSCAN   = len(SCAN_D)
+_DIG     = bytearray(_NSCAN)
+_RAW     = array.array('H', [0] * _NSCAN)
+_MV      = array.array('H', [0] * _NSCAN)  # _RAW scaled to millivolts (ADC_FAIL kept as is)
+_VREF_MV = int(VREF * 1000 + 0.5)
+_ADC_Q   = int(65535 * 0.05 / VREF)  # raw counts per 50 mV change-detection step
+
+# /api/pins body is one %-format of a template built at boot: the JSON
+# skeleton (keys, order, nulls for pins without a Pin/ADC) is fixed, only
+# the numbers change, so no json.dumps and no per-field concatenation.
+# Volts go out as "%d.%03d" from integer millivolts, so no floats either.
+def _pins_template():
+    head = b'{"order":[' + b','.join([b'%d' % d for d in D_PINS]) + b'],"values":{'
+    pins = []
+    volts = []  # (position of the volt arguments, pin index)
+    nargs = 0
+    for d in D_PINS:
+        i = SCAN_D.index(d) if d in SCAN_D else -1
+        if i >= 0 and PINS[i] is not None:
+            dig = b'%d'
+            nargs += 1
+        elif d in UART_D:
+            dig = b'0'
+        else:
+            dig = b'null'
+        if i >= 0 and ADCS[i] is not None:
+            adc = b'"adc":%d,"volt":%d.%03d'
+            volts.append((nargs + 1, i))
+            nargs += 3
+        else:
+            adc = b'"adc":null,"volt":null'
+        pins.append(b'"%d":{"digital":' % d + dig + b',' + adc + b'}')
+    return head + b','.join(pins) + b'}}', nargs, tuple(volts)
+
+_PINS_FMT, _NARGS, _VOLT_ARGS = _pins_template()
+_ARGS = [0] * _NARGS  # template arguments, rewritten in place by _sample()
+
+# raw -> millivolts for the whole _RAW buffer in one viper call (machine ints,
+# no boxing). >> 16 instead of // 65535: at most 1 mV low, and no division.
+@micropython.viper
+def _scale_mv(raw, mv, n: int, vref: int):
+    src = ptr16(raw)
+    dst = ptr16(mv)
+    for i in range(n):
+        r = src[i]
+        if r == ADC_FAIL:
+            dst[i] = r
+        else:
+            dst[i] = (r * vref) >> 16
+
+@micropython.native
+def _sample():
+    """Read every pin once and fill _DIG/_RAW/_MV and the template arguments
+    (_ARGS).
+
+    Returns True when a level changed or an ADC reading moved to another 50 mV
+    step since the previous sample. A failed digital read counts as 0; a failed
+    ADC read is stored as ADC_FAIL and sent as -1 / -1.000 (the UI skips
+    negative volts).
+    """
+    # module globals aliased to locals once: the loop then uses register/fast
+    # loads instead of a dict lookup per access
+    pins, adcs, dig, rawb, args = PINS, ADCS, _DIG, _RAW, _ARGS
+    masks, hi, q, mem = _MASKS, _HI, _ADC_Q, _mem32
+    changed = False
+    if mem is not None:
+        reg0 = mem[GPIO_IN]
+        reg1 = mem[GPIO_IN1]
+    k = 0
+    for i in range(_NSCAN):
+        pin = pins[i]
+        if pin is not None:
+            if mem is not None:
+                lvl = 1 if (reg1 if hi[i] else reg0) & masks[i] else 0
+            else:
+                try: lvl = pin.value()
+                except: lvl = 0
+            if lvl != dig[i]:
+                dig[i] = lvl
+                changed = True
+            args[k] = lvl
+            k += 1
+        adc = adcs[i]
+        if adc is not None:
             try:
-                raw = adc.read_u16()
-                volt = raw / 65535 * VREF
+                # average 4 conversions: steadies readings that sit near the UI's
+                # 2.0 V HIGH/LOW threshold, so noise doesn't flip the dot (or the
+                # change check) every poll
+                raw = (adc.read_u16() + adc.read_u16() + adc.read_u16() + adc.read_u16()) >> 2
+                raw = min(raw, ADC_FAIL - 1)
             except:
-                pass
-    return {'digital': dig, 'adc': raw, 'volt': volt}
+                raw = ADC_FAIL
+            if raw // q != rawb[i] // q:
+                changed = True
+            rawb[i] = raw
+            args[k] = -1 if raw == ADC_FAIL else raw
+            k += 3
+    mvb = _MV
+    _scale_mv(rawb, mvb, _NSCAN, _VREF_MV)
+    for k, i in _VOLT_ARGS:
+        mv = mvb[i]
+        if mv == ADC_FAIL:
+            args[k] = -1
+            args[k + 1] = 0
+        else:
+            args[k] = mv // 1000
+            args[k + 1] = mv % 1000
+    return changed
+
+def pins_json():
+    """Encode the last sample as the /api/pins body (bytes)."""
+    return _PINS_FMT % tuple(_ARGS)
+
+# /api/pins.bin: the same sample packed for the GPIO view. 8-byte header
+# (uptime_s, free heap: big-endian uint32), then 4 bytes per pin in D_PINS
+# order: D number, level (0/1, 0xFF when unavailable), millivolts (big-endian
+# uint16, 0xFFFF when there is no reading). Pin numbers and the fixed fields
+# are written at boot; the encoder only touches pins with a Pin or ADC.
+def _bin_template():
+    buf = bytearray(8 + 4 * len(D_PINS))
+    digs = []
+    adcs = []
+    for j, d in enumerate(D_PINS):
+        off = 8 + 4 * j
+        i = SCAN_D.index(d) if d in SCAN_D else -1
+        struct.pack_into('>BBH', buf, off, d, 0 if d in UART_D else 0xFF, 0xFFFF)
+        if i >= 0 and PINS[i] is not None:
+            digs.append((off + 1, i))
+        if i >= 0 and ADCS[i] is not None:
+            adcs.append((off + 2, i))
+    return buf, tuple(digs), tuple(adcs)
+
+_BIN, _BIN_DIG, _BIN_ADC = _bin_template()
+
+def pins_bin():
+    """Encode the last sample as the /api/pins.bin body (bytes)."""
+    struct.pack_into('>II', _BIN, 0, uptime_s(), gc.mem_free())
+    for off, i in _BIN_DIG:
+        _BIN[off] = _DIG[i]
+    for off, i in _BIN_ADC:
+        struct.pack_into('>H', _BIN, off, _MV[i])  # ADC_FAIL is already the 0xFFFF marker
+    return bytes(_BIN)
+
+# Sampling runs in the background every POLL_MS for as long as someone polls,
+# so a request only encodes the latest sample and never waits for ADC
+# conversions. All tabs share that sample; the JSON body is only re-encoded
+# when _sample() saw a change. The first request after an idle spell (no
+# polls for SAMPLE_IDLE_MS) samples inline and wakes the sampler.
+_snap = None      # cached pins_json() of the current sample, None when stale
+_snap_ms = None   # ticks of the current sample, None before the first one
+_poll_ms = None   # ticks of the last pins request
+
+def _take_sample(now):
+    global _snap, _snap_ms
+    if _sample():
+        _snap = None
+    _snap_ms = now
+
+def _resample():
+    global _poll_ms
+    now = time.ticks_ms()
+    _poll_ms = now
+    if _snap_ms is None or time.ticks_diff(now, _snap_ms) >= 2 * POLL_MS:
+        _take_sample(now)
+
+def pins_snapshot():
+    global _snap
+    _resample()
+    if _snap is None:
+        _snap = pins_json()
+    return _snap
+
+def pins_bin_snapshot():
+    _resample()
+    return pins_bin()
 
 # ---------- optional pinmap.json ----------
+# Read once at boot (edit + reset to apply), not on every /api/info.
+try:
+    with open("pinmap.json", "r") as f:
+        _PINMAP_CACHE = json.loads(f.read())
+except:
+    _PINMAP_CACHE = {}
+
 def load_pinmap():
+    return _PINMAP_CACHE
+
+
+# ---------- /api/info ----------
+def _jv(v):
+    """JSON bytes for a scalar or small nested value (None -> null)."""
+    if v is None:
+        return b'null'
+    if type(v) is int:
+        return b'%d' % v
+    return json.dumps(v).encode()
+
+def _info_static():
+    """Fields that cannot change while running, serialised once at boot."""
+    return b''.join((
+        b'{"psram_total":%d,"psram_used":null' % (8 * 1024 * 1024),
+        b',"flash_size":', _jv(flash_size()),
+        b',"board":', _jv(sys.platform),
+        b',"cores":%d' % cores_count(),
+        b',"chip_model":', _jv(_CHIP_MODEL_CACHE),
+        b',"chip_revision":2',
+        b',"order":', _jv(_ORDER),
+        b',"firmware":', _jv(_BUILD_INFO_CACHE),
+        b',"pinmap":', _jv(load_pinmap() or None),
+    ))
+
+_INFO_PREFIX = _info_static()
+del _info_static
+
+def info_json():
+    """Build the /api/info body (ESP Info tab + top pills).
+
+    The constant fields come from _INFO_PREFIX; only live values are
+    formatted per request, appended as JSON fragments with one final join.
+    """
+    try:
+        ni = network_info()
+    except Exception:
+        ni = {}
+
+    heap = heap_info()
+    fs   = fs_info()
+
+    # Heap
+    heap_used  = heap.get('alloc') if heap else None
+    heap_free  = heap.get('free')  if heap else None
+    heap_total = (heap_used + heap_free) if (heap_used is not None and heap_free is not None) else None
+
+    # FS (robust percentage; works when used==0 and avoids div/0)
+    fs_used  = fs['used']  if fs else None
+    fs_total = fs['total'] if fs else None
+    fs_pct = b'null'
+    if fs_total not in (None, 0) and fs_used is not None:
+        fs_pct = b'%.1f' % ((fs_used / fs_total) * 100)
+    fs_j = (b'{"total":%d,"free":%d,"used":%d}' % (fs['total'], fs['free'], fs['used'])) if fs else b'null'
+
+    return b''.join((
+        _INFO_PREFIX,
+
+        # Runtime & Timers
+        b',"ip":', _jv(ni.get('ip')),
+        b',"cpu_freq_mhz":', _jv(cpu_freq_mhz()),
+        b',"uptime_s":%d' % uptime_s(),
+
+        # Memory & Storage
+        b',"heap":{"free":%d,"alloc":%d}' % (heap_free, heap_used),
+        b',"fs":', fs_j,
+        b',"heap_used":%d,"heap_total":%d,"heap_free":%d' % (heap_used, heap_total, heap_free),
+        b',"fs_used":', _jv(fs_used),
+        b',"fs_total":', _jv(fs_total),
+        b',"fs_used_pct":', fs_pct,
+
+        # Network & Connectivity
+        b',"ssid":', _jv(ni.get('ssid')),
+        b',"rssi":', _jv(ni.get('rssi')),
+        b',"mac_sta":', _jv(ni.get('mac_sta')),
+        b',"netmask":', _jv(ni.get('netmask')),
+        b',"gw":', _jv(ni.get('gw')),
+        b',"dns":', _jv(ni.get('dns')),
+        b'}',
+    ))
+
+
+# ---------- cached page ----------
+# The page never changes at runtime. Its response is prepared once at import:
+# a header with Content-Length baked in, plus the body as a list of slices.
+# The body is the gpio_page literal cut at its placeholders (memoryview
+# slices, no copy) with the three small JSON fragments in between, so when
+# gpio_page is frozen the HTML is sent straight from flash and never copied
+# onto the heap.
+#
+# A gzip copy is kept on flash as PAGE_GZ for browsers that accept it (~4x
+# less Wi-Fi airtime). Firmware with the deflate module (re)writes it at boot
+# whenever the page changed; without deflate a hand-made `gzip -9` copy of the
+# page can be uploaded instead.
+PAGE_GZ = 'page.html.gz'
+
+def _build_page_gz(parts):
+    """Refresh PAGE_GZ from the body parts when possible; return its size (0 = none)."""
+    try:
+        import deflate, io
+        out = io.BytesIO()
+        z = deflate.DeflateIO(out, deflate.GZIP, 12)
+        for p in parts:
+            z.write(p)
+        z.close()
+        gz = out.getvalue()
+        try:
+            with open(PAGE_GZ, 'rb') as f:
+                stale = f.read() != gz
+        except:
+            stale = True
+        if stale:
+            with open(PAGE_GZ, 'wb') as f:
+                f.write(gz)
+    except:
+        pass
     try:
-        with open("pinmap.json", "r") as f:
-            return json.loads(f.read())
+        return os.stat(PAGE_GZ)[6]
     except:
-        return {}
-
-
-def page_html():
-    overlay_json = json.dumps(PIN_OVERLAY)
-    adc_list_json = json.dumps(sorted(list(ADC_D)))
-
-    html = (
-        "<!doctype html><html><head><meta charset='utf-8'/>"
-        "<meta name='viewport' content='width=device-width,initial-scale=1'/>"
-        "<title>Seeed Studio XIAO ESP32S3 GPIO Pin Monitoring</title>"
-        "<style>"
-       ' /* ---- color system (light/dark) ---- */'
-        ":root{"
-        " --bg:#ffffff; --text:#111;"
-        " --topbar-bg:rgba(255,255,255,.92); --topbar-br:#e6e7eb;"
-        " --pill-bg:#f2f4f7; --pill-text:#111;"
-        " --section-bg:#f3f4f6;"       '/* panel background */'
-        " --card-bg:#ffffff;"          '/* tile background */'
-        " --card-br:rgba(0,0,0,.10);"  '/* tile/panel borders */'
-        " --adc-bg:#777; --hole-hi:#d94134; --hole-lo:#2e9e5f;"
-        "}"
-        "[data-theme='dark']{"
-        " --bg:#0b1222; --text:#e5e7eb;"
-        " --topbar-bg:rgba(11,18,34,.92); --topbar-br:#1f2a3d;"
-        " --pill-bg:#0f1a2e; --pill-text:#e5e7eb;"
-        " --section-bg:#0f172a;"
-        " --card-bg:#152238;"          '/* brighter than section so cards pop */'
-        " --card-br:#27344b;"
-        " --adc-bg:#505965;"
-        "}"
-        '/* ---- layout ---- */'
-        "html,body{margin:0;padding:0;background:var(--bg);color:var(--text);font-family:Roboto,Arial,Helvetica,sans-serif}"
-        ".topbar{position:sticky;top:0;z-index:10;background:var(--topbar-bg);backdrop-filter:saturate(180%) blur(6px);border-bottom:1px solid var(--topbar-br)}"
-        ".topin{max-width:980px;margin:0 auto;padding:8px 12px;display:flex;flex-direction:column;align-items:center;gap:8px}"
-        ".title{font-weight:800;font-size:18px;text-align:center}"
-        ".pills{display:flex;gap:12px;align-items:center;flex-wrap:wrap;justify-content:center}"
-        ".pill{font-weight:700;font-size:12px;padding:6px 10px;border-radius:999px;background:var(--pill-bg);color:var(--pill-text);border:1px solid var(--card-br)}"
-        ".pill .lab{opacity:.7;margin-right:6px}"
-        ".pill select{border:none;background:transparent;font:inherit;outline:none;cursor:pointer;color:var(--pill-text)}"
-        ".tab{display:inline-flex;border-radius:999px;overflow:hidden;border:1px solid var(--topbar-br);background:var(--pill-bg)}"
-        ".tab button{padding:6px 10px;font-weight:700;font-size:12px;border:none;background:transparent;cursor:pointer;color:var(--pill-text)}"
-        ".tab button.act{background:#e5e7eb;color:#111}"
-        "[data-theme='dark'] .tab button.act{background:#22314a;color:#e5e7eb}"
-        ".wrap{max-width:980px;margin:0 auto 18px;padding:0 10px}"
-        ".board{position:relative;width:clamp(240px,48vw,360px);margin:12px auto 0}"
-        ".board img{width:100%;display:block;user-select:none;pointer-events:none}"
-        ".hole{position:absolute;width:23.6px;height:23.6px;margin:-11.8px 0 0 -11.8px;border-radius:50%;display:flex;align-items:center;justify-content:center;transition:background-color .25s ease,transform .08s ease;border:2px solid rgba(0,0,0,.18);box-shadow:0 1px 2px rgba(0,0,0,.15) inset}"
-        ".hole.lo{background:var(--hole-lo)}.hole.hi{background:var(--hole-hi)}.hole.na{background:#bdbdbd}"
-        ".lbl{position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);font-size:9px;font-weight:700;color:#fff;text-shadow:0 1px 1px rgba(0,0,0,.25)}"
-        ".adc{position:absolute;bottom:-6px;left:50%;transform:translateX(-50%);font-size:9px;font-weight:700;padding:1px 4px;border-radius:8px;color:#fff;background:var(--adc-bg);min-width:30px;text-align:center}"
-        ".theme{position:fixed;top:10px;right:10px;z-index:20;background:var(--pill-bg);color:var(--pill-text);border:1px solid var(--card-br);border-radius:999px;padding:6px 10px;font-weight:700;display:flex;align-items:center;gap:6px;cursor:pointer}"
-        ".theme .ic{font-size:14px;line-height:1}"
-        ".section{background:var(--section-bg);border:1px solid var(--card-br);border-radius:14px;padding:12px;margin-top:10px}"
-        ".section>h3{margin:0 0 8px 0;font-size:14px;opacity:.9}"
-        ".cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(180px,1fr));gap:10px}"
-        ".card{background:var(--card-bg);color:var(--pill-text);border-radius:12px;padding:10px;border:1px solid var(--card-br);box-shadow:0 1px 0 rgba(0,0,0,.04)}"
-        ".kv{display:grid;grid-template-columns:160px 1fr;gap:8px;margin-top:10px}"
-        ".muted{opacity:.7}"
-        "</style></head><body>"
-
-        "<button id='theme' class='theme' title='Toggle theme'><span id='themeIc' class='ic'>🌙</span><span id='themeTxt'>Dark</span></button>"
-
-        "<div class='topbar'><div class='topin'>"
-          "<div class='title'>Seeed Studio XIAO ESP32S3 GPIO Pin Monitoring</div>"
-          "<div class='pills'>"
-            "<div class='pill'><span class='lab'>IP</span><span id='ip'>—</span></div>"
-            "<div class='pill'><span class='lab'>Uptime</span><span id='uptime'>0:00</span></div>"
-            "<div class='pill'><span class='lab'>Heap</span><span id='heap'>—</span></div>"
-            "<div class='pill'><span class='lab'>Refresh</span>"
-              "<select id='rate'><option value='250'>250 ms</option>"
-              "<option value='500' selected>500 ms</option>"
-              "<option value='1000'>1 s</option><option value='2000'>2 s</option></select>"
-            "</div>"
-            "<div class='tab'><button id='tabG' class='act'>GPIO Live</button><button id='tabI'>ESP Info</button></div>"
-          "</div>"
-        "</div></div>"
-
-        "<div class='wrap'>"
-          "<div id='viewG'>"
-            "<div class='board'>"
-              "<img id='board' src='/board.jpg' onerror=\"this.onerror=null;this.src='https://raw.githubusercontent.com/TuzaaBap/Seeed-Studio-XIAO-ESP32S3-GPIOViewer/main/assets/XIAO-ESP32-S3.png'\">"
-              "<div id='overlay'></div>"
-            "</div>"
-            "<small class='muted' style='display:block;text-align:center;margin-top:6px'>Green = LOW, Red = HIGH. ADC pins show voltage.</small>"
-          "</div>"
-
-          "<div id='viewI' style='display:none'>"
-            "<div class='section'><h3>Runtime &amp; Timers</h3><div class='cards' id='secRT'></div></div>"
-            "<div class='section'><h3>Memory &amp; Storage</h3><div class='cards' id='secMEM'></div></div>"
-            "<div class='section'><h3>Network &amp; Connectivity</h3><div class='cards' id='secNET'></div></div>"
-            "<div class='section'><h3>Firmware &amp; System Info</h3><div class='kv' id='secFW'></div></div>"
-          "</div>"
-        "</div>"
-
-        "<script>"
-        "/* theme bootstrap */"
-        "(function(){try{var key='theme', saved=localStorage.getItem(key), prefers=window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches?'dark':'light';"
-        "var t=saved||prefers;document.documentElement.setAttribute('data-theme',t);"
-        "var ic=document.getElementById('themeIc'),tx=document.getElementById('themeTxt');"
-        "function setUI(x){if(!ic||!tx)return;if(x==='dark'){ic.textContent='🌙';tx.textContent='Dark';}else{ic.textContent='☀️';tx.textContent='Light';}}"
-        "setUI(t);document.getElementById('theme').onclick=function(){var cur=(document.documentElement.getAttribute('data-theme')==='dark')?'dark':'light';"
-        "var nxt=(cur==='dark')?'light':'dark';document.documentElement.setAttribute('data-theme',nxt);localStorage.setItem(key,nxt);setUI(nxt);};}catch(_){}})();"
-
-        "/* tabs */"
-        "var tabG=document.getElementById('tabG'),tabI=document.getElementById('tabI');"
-        "var viewG=document.getElementById('viewG'),viewI=document.getElementById('viewI');"
-        "function showG(){tabG.classList.add('act');tabI.classList.remove('act');viewG.style.display='';viewI.style.display='none';localStorage.setItem('view','gpio');}"
-        "function showI(){tabI.classList.add('act');tabG.classList.remove('act');viewI.style.display='';viewG.style.display='none';localStorage.setItem('view','info');}"
-        "tabG.onclick=showG;tabI.onclick=showI;(function(){var v=localStorage.getItem('view');if(v==='info')showI();})();"
-
-        "/* constants */"
-        "const MAP="+overlay_json+";const ADC_D="+adc_list_json+";const NA_PINS=new Set([6,7]);"
-        "const overlay=document.getElementById('overlay');const ipEl=document.getElementById('ip');const heapEl=document.getElementById('heap');"
-        "const uptimeEl=document.getElementById('uptime');const rateSel=document.getElementById('rate');"
-        "ipEl.textContent=location.host||(location.hostname+(location.port?':'+location.port:''));"
-
-        "/* uptime ticker */"
-        "let bootEpochMs=null;"
-        "function setUptimeBase(u){if(u!=null&&bootEpochMs==null){bootEpochMs=Date.now()-(u*1000);}}"
-        "function currentUptime(){if(bootEpochMs==null)return '—';var sec=((Date.now()-bootEpochMs)/1000)|0;var h=(sec/3600)|0,m=((sec%3600)/60)|0,s=sec%60;"
-        "return (h>0?((''+h).padStart(2,'0')+':'):'')+(''+m).padStart(2,'0')+':'+(''+s).padStart(2,'0');}"
-        "function tickUptime(){if(bootEpochMs==null)return;var sec=((Date.now()-bootEpochMs)/1000)|0;var h=(sec/3600)|0,m=((sec%3600)/60)|0,s=sec%60;"
-        "uptimeEl.textContent=(h>0?(h*60+m):m)+':'+(''+s).padStart(2,'0');var uc=document.getElementById('upCard');if(uc){uc.textContent=currentUptime();}}"
-        "setInterval(tickUptime,1000);"
-
-        "/* build GPIO dots */"
-        "for(const k of Object.keys(MAP)){const d=Number(k),p=MAP[k];const el=document.createElement('div');el.className='hole lo';el.dataset.d=d;"
-        "el.style.left=p.x+'%';el.style.top=p.y+'%';const lbl=document.createElement('div');lbl.className='lbl';lbl.textContent='D'+d;el.appendChild(lbl);"
-        "const adc=document.createElement('div');adc.className='adc';adc.textContent='';el.appendChild(adc);overlay.appendChild(el);}"
-
-        "/* helpers */"
-        "function fmtB(b){if(b==null)return '—';var kb=b/1024,mb=kb/1024;return (mb>=1?(mb.toFixed(2)+' MB'):(kb.toFixed(0)+' KB'));}"
-        "function fmtBytes(b){if(b==null||!isFinite(b))return '—';var kb=b/1024,mb=kb/1024,gb=mb/1024;if(gb>=1)return gb.toFixed(2)+' GB';if(mb>=1)return mb.toFixed(2)+' MB';if(kb>=1)return kb.toFixed(0)+' KB';return b+' B';}"
-        "function fmtPct(p){if(p==null||!isFinite(p))return '—';return (Math.round(p*10)/10)+'%';}"
-        "function badgeColor(v){if(v==null)return getComputedStyle(document.documentElement).getPropertyValue('--adc-bg')||'#777';var t=Math.max(0,Math.min(1,v/3.3));var hue=120*(1-t);var light=35+45*t;return 'hsl('+hue+'deg 90% '+light+'%)';}"
-        "function avg(arr){if(!arr||!arr.length)return null;var s=0;for(var i=0;i<arr.length;i++)s+=arr[i];return s/arr.length;}"
-        "function rel(ms){if(!ms)return '—';var d=Date.now()-ms;if(d<0)d=0;var s=Math.floor(d/1000);if(s<1)return 'just now';if(s<60)return s+'s ago';var m=Math.floor(s/60);if(m<60)return m+'m ago';var h=Math.floor(m/60);return h+'h ago';}"
-        "let lastADC={};"
-
-        "function applyADC(adc){lastADC=adc||{};for(const el of overlay.children){const d=Number(el.dataset.d);const badge=el.querySelector('.adc');const v=lastADC['D'+d];"
-        "if(v==null){badge.textContent='';badge.style.background='var(--adc-bg)';}else{badge.textContent=v.toFixed(2)+' V';badge.style.background=badgeColor(v);}}}"
-        "function applyLevels(levels){for(const el of overlay.children){const d=Number(el.dataset.d);if(NA_PINS.has(d)){el.className='hole na';continue;}const v=lastADC['D'+d];"
-        "if(v!=null){el.className='hole '+(v>=2.0?'hi':'lo');continue;}const bit=(levels&&('D'+d in levels))?levels['D'+d]:0;el.className='hole '+(bit?'hi':'lo');}}"
-
-        "/* GPIO polling */"
-        "let timer=null;"
-        "async function pollGPIO(){try{const pr=await fetch('/api/pins',{cache:'no-store'});const pins=await pr.json();"
-        "const ir=await fetch('/api/info',{cache:'no-store'});const info=await ir.json();"
-        "if(info&&info.heap)heapEl.textContent=fmtB(info.heap.free);if(info&&info.ip)ipEl.textContent=info.ip;if(info&&info.uptime_s!=null)setUptimeBase(info.uptime_s);"
-        "const adcv={};for(const d of pins.order){const v=pins.values[d];if(v&&v.volt!=null)adcv['D'+d]=v.volt;}applyADC(adcv);"
-        "const levels={};for(const d of pins.order){const v=pins.values[d];levels['D'+d]=(v&&v.digital===1)?1:0;}applyLevels(levels);}catch(_){}}"
-        "function startGPIO(iv){if(timer)clearInterval(timer);timer=setInterval(pollGPIO,iv);pollGPIO();}"
-        "startGPIO(parseInt(rateSel.value,10));rateSel.addEventListener('change',function(){startGPIO(parseInt(rateSel.value,10));});"
-
-        "/* ESP Info polling + link status */"
-        "const secRT=document.getElementById('secRT');const secMEM=document.getElementById('secMEM');const secNET=document.getElementById('secNET');const secFW=document.getElementById('secFW');"
-        "function card(label,value){return '<div class=\\'card\\'><div class=\\'muted\\'>'+(label||'')+'</div><b>'+(value==null?'—':value)+'</b></div>';}"
-        "let lastOkMs=0, failCount=0, rttSamples=[];"
-        "function updateLinkUI(){var link=document.getElementById('linkState');var last=document.getElementById('lastUpd');var rtt=document.getElementById('rttAvg');"
-        "if(!link||!last||!rtt)return; var ok=(failCount<3); link.textContent=ok?'Connected':'Disconnected'; last.textContent=rel(lastOkMs);"
-        "var a=avg(rttSamples); rtt.textContent=(a==null)?'—':(Math.round(a)+' ms');}"
-        "setInterval(updateLinkUI,1000);"
-
-        "async function pollInfo(){"
-        " try{"
-        "   var t0=Date.now();"
-        "   const r=await fetch('/api/info',{cache:'no-store'});"
-        "   const d=await r.json();"
-        "   var dt=Date.now()-t0; rttSamples.push(dt); if(rttSamples.length>5) rttSamples.shift();"
-        "   lastOkMs=Date.now(); failCount=0;"
-        "   if(d&&d.uptime_s!=null) setUptimeBase(d.uptime_s);"
-        "   var heapUsed=(d.heap_used!=null)?d.heap_used:(d.heap&&d.heap.alloc);"
-        "   var heapFree=(d.heap_free!=null)?d.heap_free:(d.heap&&d.heap.free);"
-        "   var heapTotal=(d.heap_total!=null)?d.heap_total:((heapUsed!=null&&heapFree!=null)?(heapUsed+heapFree):null);"
-        "   var fsUsed=(d.fs_used!=null)?d.fs_used:(d.fs&&d.fs.used);"
-        "   var fsTotal=(d.fs_total!=null)?d.fs_total:(d.fs&&d.fs.total);"
-        "   var fsPct=(fsUsed!=null&&fsTotal)?(fsUsed/fsTotal*100):null;"
-        "   var flashSize=(d.flash_size!=null)?d.flash_size:null;"
-        "   var flashPct=(flashSize&&fsUsed!=null)?(fsUsed/flashSize*100):null;"
-
-        "   secRT.innerHTML=["
-        "     card('CPU', (d.cpu_freq_mhz!=null?d.cpu_freq_mhz+' MHz':'—')),"
-        "     card('Uptime', '<span id=\\'upCard\\'>'+currentUptime()+'</span>')"
-        "   ].join('');"
-
-        "   secMEM.innerHTML=["
-        "     card('Heap Used/Total', (fmtBytes(heapUsed)+' / '+fmtBytes(heapTotal))),"
-        "     card('FS Used/Total', (fmtBytes(fsUsed)+' / '+fmtBytes(fsTotal))),"
-        "     card('FS Usage %', fmtPct(fsPct)),"
-        "     card('PSRAM', ((d.psram_used!=null?fmtBytes(d.psram_used):'—')+' / '+(d.psram_total!=null?fmtBytes(d.psram_total):'—'))),"
-        "     card('Flash Size', fmtBytes(flashSize)),"
-        "     card('Flash Usage %', fmtPct(flashPct))"
-        "   ].join('');"
-
-        "   secNET.innerHTML=["
-        "     card('IP', (d.ip||'—')),"
-        "     card('SSID', d.ssid),"
-        "     card('RSSI', (d.rssi!=null?d.rssi+' dBm':'—')),"
-        "     card('MAC (STA)', d.mac_sta||d.mac),"
-        "     card('Netmask', d.netmask),"
-        "     card('Gateway', d.gw),"
-        "     card('DNS', d.dns)"
-        "   ].join('');"
-
-        "   var fw=(d.firmware||{}); var build=(fw.build&&fw.build.join)?fw.build.join('.'):(fw.build||'—');"
-        "   secFW.innerHTML=["
-        "     '<div class=\\'muted\\'>Chip Model</div><div>'+(d.chip_model||'ESP32-S3')+'</div>',"
-        "     '<div class=\\'muted\\'>Chip Revision</div><div>'+(d.chip_revision!=null?d.chip_revision:'—')+'</div>',"
-        "     '<div class=\\'muted\\'>Cores</div><div>'+(d.cores!=null?d.cores:'2')+'</div>',"
-        "     '<div class=\\'muted\\'>Link</div><div id=\\'linkState\\'>—</div>',"
-        "     '<div class=\\'muted\\'>Last Update</div><div id=\\'lastUpd\\'>—</div>',"
-        "     '<div class=\\'muted\\'>RTT (avg)</div><div id=\\'rttAvg\\'>—</div>',"
-        "     '<div class=\\'muted\\'>Board</div><div>'+(d.board||'—')+'</div>',"
-        "     '<div class=\\'muted\\'>MicroPython</div><div>'+(fw.micropython||'—')+'</div>',"
-        "     '<div class=\\'muted\\'>Build</div><div>'+build+'</div>'"
-        "   ].join('');"
-        "   updateLinkUI();"
-        " }catch(_){ failCount++; if(failCount>50) failCount=50; updateLinkUI(); }"
-        "}"
-        "setInterval(pollInfo,1500);pollInfo();"
-        "</script></body></html>"
-    )
-    return html
+        return 0
+
+def _build_page():
+    from gpio_page import PAGE
+    mv = memoryview(PAGE)
+    parts = []
+    i = 0
+    for key, val in ((b'{OVERLAY}', PIN_OVERLAY),
+                     (b'{ADC}', sorted(list(ADC_D))),
+                     (b'{NA}', list(UART_D))):
+        j = PAGE.find(key, i)
+        parts.append(mv[i:j])
+        parts.append(memoryview(json.dumps(val).encode()))
+        i = j + len(key)
+    parts.append(mv[i:])
+    del PAGE, mv
+    sys.modules.pop('gpio_page', None)  # the slices keep the literal alive
+    hdr = ("HTTP/1.1 200 OK\r\n"
+           "Content-Type: text/html; charset=utf-8\r\n"
+           "Content-Length: %d\r\n"
+           "Cache-Control: public, max-age=3600\r\n"
+           "Vary: Accept-Encoding\r\n"
+           "Connection: close\r\n\r\n" % sum([len(p) for p in parts])).encode()
+    gz_len = _build_page_gz(parts)
+    gz_hdr = None
+    if gz_len:
+        gz_hdr = ("HTTP/1.1 200 OK\r\n"
+                  "Content-Type: text/html; charset=utf-8\r\n"
+                  "Content-Encoding: gzip\r\n"
+                  "Content-Length: %d\r\n"
+                  "Cache-Control: public, max-age=3600\r\n"
+                  "Vary: Accept-Encoding\r\n"
+                  "Connection: close\r\n\r\n" % gz_len).encode()
+    return hdr, tuple(parts), gz_hdr
+
+PAGE_HDR, PAGE_PARTS, PAGE_GZ_HDR = _build_page()
+# The builders are never needed again; release them (and the gzip scratch
+# buffers) before the server allocates anything.
+del _build_page, _build_page_gz
+gc.collect()
 
 # ---------- HTTP server (optimized) ----------
+REQ_MAX  = const(4096)  # request line + headers we buffer; a longer head gets a 400
+LINE_MAX = const(2048)  # longest single request/header line accepted (long Cookie / UA lines fit)
+
+# Response headers are bytes templates built once; only Content-Length is
+# formatted per response (no str header, no .encode()).
+def _hdr(status, ctype, conn=b'Connection: close\r\n'):
+    return (b'HTTP/1.1 ' + status + b'\r\n'
+            b'Content-Type: ' + ctype + b'\r\n'
+            b'Cache-Control: no-store\r\n' + conn +
+            b'Content-Length: %d\r\n\r\n')
+
+HDR_JSON = _hdr(b'200 OK', b'application/json')
+HDR_BIN  = _hdr(b'200 OK', b'application/octet-stream')
+_KA = b'Connection: keep-alive\r\nKeep-Alive: timeout=%d\r\n' % KEEPALIVE_S
+HDR_JSON_KA = _hdr(b'200 OK', b'application/json', _KA)
+HDR_BIN_KA  = _hdr(b'200 OK', b'application/octet-stream', _KA)
+HDR_404  = _hdr(b'404 Not Found', b'text/plain')
+HDR_400  = _hdr(b'400 Bad Request', b'text/plain')
+
+# Fixed-body responses are prebuilt whole: one write of a constant, nothing
+# formatted or concatenated per request.
+def _resp(hdr, body):
+    return hdr % len(body) + body
+
+RESP_404      = _resp(HDR_404, b'Not Found')
+RESP_400      = _resp(HDR_400, b'Bad Request')
+RESP_NO_BOARD = _resp(HDR_404, b'Missing board.jpg')
+
+# ---------- board image (streamed) ----------
+# Streamed from flash through _send_file's buffer, never held in RAM. The
+# ETag (size-mtime) lets browsers revalidate with a bodyless 304 once the
+# day-long max-age runs out.
+_BOARD_CACHE = b'Cache-Control: public, max-age=86400\r\nConnection: close\r\n'
+
+def _board_etag(st):
+    return b'"%x-%x"' % (st[6], st[8])
+
+async def _read_head(reader, buf=b''):
+    """Read the request head, normally in one read(); stops at the blank line or REQ_MAX.
+
+    buf is what the previous read on this connection got past its head (a
+    pipelined request). Returns (head, rest): the head up to and including
+    the blank line, and any bytes after it for the next request.
+    """
+    while b'\r\n\r\n' not in buf and len(buf) < REQ_MAX:
+        chunk = await reader.read(REQ_MAX - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    end = buf.find(b'\r\n\r\n')
+    if end < 0:
+        return buf, b''
+    return buf[:end + 4], buf[end + 4:]
+
+# Nagle would hold each small JSON response back waiting for an ACK; turn it
+# off per connection where the socket module exposes TCP_NODELAY.
+try:
+    import socket
+    _NODELAY = (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+except:
+    _NODELAY = None
 
-
-async def _serve(reader, writer):
-    try:
-        # ---- request line ----
-        line = await reader.readline()
-        if not line:
-            await writer.aclose()
-            return
+def _nodelay(writer):
+    if _NODELAY:
         try:
-            parts = line.decode().split(' ')
-            method, path = parts[0], parts[1]
-        except Exception:
-            method, path = 'GET', '/'
-
-        # ---- consume headers ----
-        while True:
-            h = await reader.readline()
-            if not h or h == b'\r\n':
-                break
-
-        # ---- responder ----
-        def send(status='200 OK', ctype='text/html', body=b''):
-            try:
-                writer.write(b'HTTP/1.1 ' + status.encode() + b'\r\n')
-                writer.write(b'Content-Type: ' + ctype.encode() + b'\r\n')
-                writer.write(b'Cache-Control: no-store\r\n')
-                writer.write(b'Connection: close\r\n')
-                writer.write(b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n')
-                if body:
-                    writer.write(body)
-            except:
-                pass
-
-        # ---- routes ----
-        if path == '/' or path.startswith('/index') or path == '/info':
-            send(body=page_html().encode())
-
-        elif path.startswith('/board.jpg'):
-            # optional local board image
-            try:
-                with open('board.jpg', 'rb') as f:
-                    send(ctype='image/jpeg', body=f.read())
-            except Exception:
-                send('404 Not Found', 'text/plain', b'Missing board.jpg')
-
-        elif path.startswith('/api/pins'):
-            # live GPIO snapshot only
-            vals = {d: read_d_pin(d) for d in D_PINS}
-            body = json.dumps({'order': list(D_PINS), 'values': vals}).encode()
-            send('200 OK', 'application/json', body)
-
-        elif path.startswith('/api/info'):
-            # ---- Build payload for ESP Info + top pills ----
-            try:
-                ni = network_info()
-            except Exception:
-                ni = {}
-
-            heap = heap_info()
-            fs   = fs_info()
-            flsz = flash_size()
-
-            # Heap
-            heap_used  = heap.get('alloc') if heap else None
-            heap_free  = heap.get('free')  if heap else None
-            heap_total = (heap_used + heap_free) if (heap_used is not None and heap_free is not None) else None
-
-            # FS (robust percentage; works when used==0 and avoids div/0)
-            fs_used  = fs['used']  if fs else None
-            fs_total = fs['total'] if fs else None
-            fs_pct = None
-            if fs_total not in (None, 0) and fs_used is not None:
-                fs_pct = round((fs_used / fs_total) * 100, 1)
-
-            payload = {
-                # Runtime & Timers
-                'ip': ni.get('ip'),
-                'cpu_freq_mhz': cpu_freq_mhz(),
-                'uptime_s': uptime_s(),
-
-                # Memory & Storage
-                'heap': heap,
-                'flash_size': flsz,
-                'fs': fs,
-                'heap_used': heap_used,
-                'heap_total': heap_total,
-                'heap_free': heap_free,
-                'fs_used': fs_used,
-                'fs_total': fs_total,
-                'fs_used_pct': fs_pct,
-                'psram_total': 8 * 1024 * 1024,
-                'psram_used': None,
-
-                # Network & Connectivity
-                'ssid': ni.get('ssid'),
-                'rssi': ni.get('rssi'),
-                'mac_sta': ni.get('mac_sta'),
-                'netmask': ni.get('netmask'),
-                'gw': ni.get('gw'),
-                'dns': ni.get('dns'),
-
-                # Firmware & System Info
-                'firmware': build_info(),
-                'board': sys.platform,
-                'cores': cores_count(),
-                'chip_model': detect_chip_model(),
-                'chip_revision': 2,
-
-                # Extras used by UI
-                'order': list(D_PINS),
-                'pinmap': load_pinmap() or None,
-            }
-            send('200 OK', 'application/json', json.dumps(payload).encode())
+            writer.s.setsockopt(_NODELAY[0], _NODELAY[1], 1)
+        except:
+            pass
 
-        else:
-            send('404 Not Found', 'text/plain', b'Not Found')
+def _head_ok(head, end):
+    """True when head[:end] has fewer than HDR_LINES_MAX lines, none over LINE_MAX."""
+    i = 0
+    lines = 0
+    while i <= end:
+        j = head.find(b'\r\n', i)
+        if j < 0 or j > end:
+            j = end
+        if j - i > LINE_MAX:
+            return False
+        lines += 1
+        if lines >= HDR_LINES_MAX:
+            return False
+        i = j + 2
+    return True
+
+def _header(head, name):
+    """Value of header `name` in the request head, or b''. Names match in any case."""
+    name = name.lower()
+    k = len(name)
+    i = head.find(b'\r\n')
+    while i >= 0:
+        i += 2
+        # cheap ':' position check first, so most lines are never sliced
+        if head[i + k:i + k + 1] == b':' and head[i:i + k].lower() == name:
+            j = head.find(b'\r\n', i)
+            return head[i + k + 1:j if j >= 0 else len(head)].strip()
+        i = head.find(b'\r\n', i)
+    return b''
+
+async def _send_file(writer, f, hdr):
+    """Stream the open file f in 1 KB chunks through one buffer, then close it;
+    hdr rides along with the first chunk so headers never go out as a segment
+    of their own. The caller opens f, so a missing file is known before
+    anything is written."""
+    with f:
+        buf = bytearray(1024)
+        mv = memoryview(buf)
+        n = f.readinto(buf)
+        writer.write(hdr + mv[:n])
+        while n:
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT_S)
+            n = f.readinto(buf)
+            if n:
+                writer.write(mv[:n])
+
+
+
+async def _send_parts(writer, hdr, parts):
+    """Write the buffers in parts (memoryviews) in 1 KB slices, draining in
+    between; hdr rides along with the first slice."""
+    for p in parts:
+        for i in range(0, len(p), 1024):
+            if hdr:
+                writer.write(hdr + p[i:i + 1024])
+                hdr = None
+            else:
+                writer.write(p[i:i + 1024])
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT_S)
 
-        await writer.drain()
+async def _serve(reader, writer):
+    _nodelay(writer)
 
-    except Exception as e:
+    # ---- responder ----
+    def send(hdr, body=b''):
+        # header + body go out as one buffer: one write, one send
         try:
-            writer.write(b'HTTP/1.1 500\r\nContent-Type: text/plain\r\n\r\n' + str(e).encode())
-            await writer.drain()
+            writer.write(hdr % len(body) + body)
         except:
             pass
+
+    try:
+        # /api/* polls may keep the connection for up to KEEPALIVE_MAX requests;
+        # everything else (page, image, errors) closes after one response.
+        rest = b''  # bytes read past the previous head (pipelined request)
+        for n in range(KEEPALIVE_MAX):
+            # ---- request head: one bulk read instead of a readline per header ----
+            # Bounded in time (a slow or idle client can't pin this task) and in
+            # size (REQ_MAX bytes in all, LINE_MAX per line, HDR_LINES_MAX lines).
+            head, rest = await asyncio.wait_for(_read_head(reader, rest), KEEPALIVE_S if n else HEAD_TIMEOUT_S)
+            if not head:
+                return
+            end = head.find(b'\r\n\r\n')
+            if end < 0 and len(head) < REQ_MAX:
+                return  # client hung up mid-head
+            if end < 0 or not _head_ok(head, end):
+                writer.write(RESP_400)
+                await asyncio.wait_for(writer.drain(), SEND_TIMEOUT_S)
+                return
+            # Only GET is served: anything else (or a garbled request line from a
+            # port scanner) is dropped before any routing work. The path is sliced
+            # out by index: split() would also copy the rest of the head.
+            if not head.startswith(b'GET '):
+                return
+            sp = head.find(b' ', 4)
+            if sp < 0:
+                return
+            path = head[4:sp]
+
+            # HTTP/1.1 defaults to persistent connections unless the client opts out
+            keep = (n < KEEPALIVE_MAX - 1 and path.startswith(b'/api/')
+                    and head.startswith(b'HTTP/1.1', sp + 1)
+                    and _header(head, b'Connection').lower() != b'close')
+            if keep:
+                hdr_json, hdr_bin = HDR_JSON_KA, HDR_BIN_KA
+            else:
+                hdr_json, hdr_bin = HDR_JSON, HDR_BIN
+
+            # ---- routes ----
+            if path == b'/' or path.startswith(b'/index') or path == b'/info':
+                f = None
+                if PAGE_GZ_HDR and b'gzip' in _header(head, b'Accept-Encoding'):
+                    try:
+                        f = open(PAGE_GZ, 'rb')
+                    except OSError:
+                        pass  # PAGE_GZ went missing: fall back to the plain page
+                # Only the open may fall back: once streaming has started, an
+                # error goes to the outer handler, which drops the connection.
+                if f:
+                    await _send_file(writer, f, PAGE_GZ_HDR)
+                else:
+                    await _send_parts(writer, PAGE_HDR, PAGE_PARTS)
+
+            elif path.startswith(b'/board.jpg'):
+                # optional local board image
+                f = None
+                try:
+                    st = os.stat('board.jpg')
+                    tag = _board_etag(st)
+                    hit = _header(head, b'If-None-Match') == tag
+                    if not hit:
+                        f = open('board.jpg', 'rb')
+                except OSError:
+                    st = None
+                if st is None:
+                    writer.write(RESP_NO_BOARD)
+                else:
+                    etag = b'ETag: ' + tag + b'\r\n'
+                    if hit:
+                        writer.write(b'HTTP/1.1 304 Not Modified\r\n' + etag + _BOARD_CACHE + b'\r\n')
+                    else:
+                        await _send_file(writer, f,
+                                         b'HTTP/1.1 200 OK\r\nContent-Type: image/jpeg\r\n' + etag +
+                                         _BOARD_CACHE + b'Content-Length: %d\r\n\r\n' % st[6])
+
+            elif path.startswith(b'/api/poll'):
+                # dashboard poll: both payloads in one round trip
+                send(hdr_json, b''.join((b'{"pins":', pins_snapshot(), b',"info":', info_json(), b'}')))
+
+            elif path.startswith(b'/api/pins.bin'):
+                # packed snapshot for the GPIO view (see pins_bin)
+                send(hdr_bin, pins_bin_snapshot())
+
+            elif path.startswith(b'/api/pins'):
+                # live GPIO snapshot only (latest background sample)
+                send(hdr_json, pins_snapshot())
+
+            elif path.startswith(b'/api/info'):
+                send(hdr_json, info_json())
+
+            else:
+                writer.write(RESP_404)
+                keep = False
+
+            # Bounded flush: a client that stops reading must not keep the buffered
+            # response (and this task) alive; on timeout just drop the connection.
+            await asyncio.wait_for(writer.drain(), SEND_TIMEOUT_S)
+            if not keep:
+                break
+
+    except asyncio.TimeoutError:
+        pass
+    except Exception as e:
+        # The response may already be half written: don't append a 500 to it,
+        # just log and drop the connection.
+        print('[GPIOLive] request error:', e)
     finally:
         try:
             await writer.aclose()
         except:
             pass
 
+# ---------- background ticker ----------
+# All periodic work shares one coroutine and one wakeup per TICK_MS: LED step
+# every tick, pin sampling every POLL_MS while someone polls, heap check every
+# GC_S. It sleeps to a fixed deadline rather than a fixed TICK_MS after the
+# work, so the pace holds while the server is busy; when behind it re-anchors
+# and just yields.
+_SAMPLE_TICKS = max(1, POLL_MS // TICK_MS)
+_GC_TICKS     = max(1, GC_S * 1000 // TICK_MS)
+
+async def _ticker():
+    led = samp = gct = 0
+    next_t = time.ticks_ms()
+    while True:
+        now = time.ticks_ms()
+        if _pwm:
+            try: _pwm.duty_u16(_BREATH_LUT[led])
+            except: pass
+            led = (led + 1) & 63
+        samp += 1
+        if samp >= _SAMPLE_TICKS:
+            samp = 0
+            if _poll_ms is not None and time.ticks_diff(now, _poll_ms) < SAMPLE_IDLE_MS:
+                _take_sample(now)
+        gct += 1
+        if gct >= _GC_TICKS:
+            gct = 0
+            _maybe_gc()
+        next_t = time.ticks_add(next_t, TICK_MS)
+        dt = time.ticks_diff(next_t, time.ticks_ms())
+        if dt <= 0:
+            next_t = time.ticks_ms()
+            dt = 0
+        await asyncio.sleep_ms(dt)
+
 # ---------- Main Run ----------
 async def run():
-    await asyncio.start_server(_serve, '0.0.0.0', HTTP_PORT)
+    await asyncio.start_server(_serve, '0.0.0.0', HTTP_PORT, backlog=HTTP_BACKLOG)
     print('[GPIOLive] v1.0.2 listening on port', HTTP_PORT)
-    asyncio.create_task(_breathe())
+    asyncio.create_task(_ticker())
     try:
         while True:
             await asyncio.sleep(3600)